@@ -1,23 +1,148 @@
+import functools
 import logging
 import math
+import operator
 import re
 import secrets
+import threading
+from collections import Counter
 from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    import hyperscan
+except Exception:  # pragma: no cover - optional dependency
+    hyperscan = None  # type: ignore
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+try:
+    import numba
+except Exception:  # pragma: no cover - optional dependency
+    numba = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# Patterns are ASCII-only by design; re.ASCII skips Unicode tables for \d, \s and \b.
 PII_REGEXES = {
-    "email": re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE),
-    "phone": re.compile(r"\b\+?\d{1,2}[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}\b"),
-    "medicare": re.compile(r"\b\d{4}\s?\d{4}\s?\d{4}\b"),
-    "tfn": re.compile(r"\b\d{3}\s?\d{3}\s?\d{3}\b"),
+    "email": re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE | re.ASCII),
+    "phone": re.compile(r"\b\+?\d{1,2}[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}\b", re.ASCII),
+    "medicare": re.compile(r"\b\d{4}\s?\d{4}\s?\d{4}\b", re.ASCII),
+    "tfn": re.compile(r"\b\d{3}\s?\d{3}\s?\d{3}\b", re.ASCII),
 }
 
 SECRET_REGEXES = {
-    "api_key": re.compile(r"(?i)(api|token|secret|key)[=:]\s*['\"]?[A-Za-z0-9-_]{12,}"),
-    "jwt": re.compile(r"eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+"),
+    "api_key": re.compile(r"(?i)(api|token|secret|key)[=:]\s*['\"]?[A-Za-z0-9-_]{12,}", re.ASCII),
+    "jwt": re.compile(r"eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+", re.ASCII),
 }
 
+ENTROPY_TOKEN_RE = re.compile(r"[A-Za-z0-9\-_]{8,}")
+# Shorter tokens are never scored; they are too short to be meaningful secrets.
+ENTROPY_MIN_TOKEN_LEN = 16
+# Below this length NumPy array setup costs more than the pure-Python reduction.
+NUMPY_ENTROPY_MIN_LEN = 32
+
+# Ordered (label, regex) pairs; the index doubles as the Hyperscan expression id.
+ALL_REGEXES = list(PII_REGEXES.items()) + list(SECRET_REGEXES.items())
+
+
+def _build_hyperscan_db() -> "hyperscan.Database":
+    """
+    Compile every PII/secret regex into one Hyperscan database used as a prefilter.
+    Prefilter mode never misses a match the `re` pattern would find, so a single pass
+    tells us which patterns are worth running through `re.finditer` for exact spans.
+    """
+    base = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+    flags = []
+    for _, regex in ALL_REGEXES:
+        pattern_flags = base
+        if regex.flags & re.IGNORECASE:
+            pattern_flags |= hyperscan.HS_FLAG_CASELESS
+        # Unicode \b/\d semantics only for non-ASCII patterns; mixing them would let
+        # the prefilter miss ASCII word boundaries next to non-ASCII letters.
+        if not regex.flags & re.ASCII:
+            pattern_flags |= hyperscan.HS_FLAG_UCP
+        flags.append(pattern_flags)
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(
+        expressions=[regex.pattern.encode() for _, regex in ALL_REGEXES],
+        ids=list(range(len(ALL_REGEXES))),
+        elements=len(ALL_REGEXES),
+        flags=flags,
+    )
+    return db
+
+
+if numba is not None and np is not None:
+
+    @numba.njit(cache=True)
+    def _shannon_u8(buf: "np.ndarray") -> float:  # pragma: no cover - JIT-compiled
+        """Shannon entropy of a uint8 buffer via a 256-bin histogram."""
+        hist = np.zeros(256, dtype=np.int64)
+        for b in buf:
+            hist[b] += 1
+        n = buf.shape[0]
+        ent = 0.0
+        for c in hist:
+            if c:
+                p = c / n
+                ent -= p * np.log2(p)
+        return ent
+
+    @numba.njit(cache=True)
+    def _token_runs_u8(
+        buf: "np.ndarray", table: "np.ndarray", min_len: int
+    ) -> "np.ndarray":  # pragma: no cover - JIT-compiled
+        """(start, end) offsets of maximal runs of table bytes at least min_len long."""
+        n = buf.shape[0]
+        out = np.empty((n // (min_len + 1) + 1, 2), dtype=np.int64)
+        k = 0
+        start = -1
+        for i in range(n):
+            if table[buf[i]]:
+                if start < 0:
+                    start = i
+            elif start >= 0:
+                if i - start >= min_len:
+                    out[k, 0] = start
+                    out[k, 1] = i
+                    k += 1
+                start = -1
+        if start >= 0 and n - start >= min_len:
+            out[k, 0] = start
+            out[k, 1] = n
+            k += 1
+        return out[:k]
+
+    # Byte lookup table for the ENTROPY_TOKEN_RE character class.
+    _TOKEN_BYTE_TABLE = np.zeros(256, dtype=np.bool_)
+    for _ch in b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_":
+        _TOKEN_BYTE_TABLE[_ch] = True
+
+else:  # pragma: no cover - optional dependency
+    _shannon_u8 = None
+    _token_runs_u8 = None
+
+
+# Pipeline components _scan_spacy never reads; only the NER entities are used.
+SPACY_EXCLUDED_COMPONENTS = ["tagger", "parser", "lemmatizer", "attribute_ruler"]
+SPACY_PII_LABELS = {"PERSON", "GPE", "ORG", "NORP", "LOC"}
+SPACY_BATCH_SIZE = 64
+
+
+@functools.lru_cache(maxsize=4)
+def _load_spacy(name: str, use_gpu: bool = False) -> Any:
+    """Load a spaCy model once per process with unused components excluded."""
+    import spacy  # type: ignore
+
+    # GPU allocation must happen before load; fall back to CPU if no device exists.
+    if use_gpu and not spacy.prefer_gpu():
+        logger.warning("spaCy GPU requested but no CUDA device found; using CPU.")
+    return spacy.load(name, exclude=SPACY_EXCLUDED_COMPONENTS)
+
 
 @dataclass
 class SensitiveSegment:
@@ -31,7 +156,10 @@ class SensitiveSegment:
 
 @dataclass
 class DLPResult:
-    """Aggregate result of DLP analysis with scores and sensitive spans."""
+    """
+    Aggregate result of DLP analysis with scores and sensitive spans.
+    `sensitive_segments` is ordered by ascending start offset.
+    """
 
     pii_score: float
     secret_leakage_score: float
@@ -45,55 +173,125 @@ class DLPEngine:
     Scores are 0-1; higher means riskier. Only synthetic prompts should be used.
     """
 
-    def __init__(self, enable_spacy: bool = False, spacy_model: str = "en_core_web_sm") -> None:
-        """Initialize the DLP engine, optionally enabling spaCy NER."""
+    def __init__(
+        self,
+        enable_spacy: bool = False,
+        spacy_model: str = "en_core_web_sm",
+        use_gpu: bool = False,
+    ) -> None:
+        """
+        Initialize the DLP engine, optionally enabling spaCy NER.
+        `use_gpu` runs NER on a CUDA device when available; pair with analyze_many.
+        """
         self.enable_spacy = enable_spacy
         self.nlp = None
         if self.enable_spacy:
             try:
-                import spacy  # type: ignore
-
-                self.nlp = spacy.load(spacy_model)
+                self.nlp = _load_spacy(spacy_model, use_gpu)
             except Exception as exc:  # pragma: no cover - optional dependency
                 logger.warning("spaCy model load failed: %s; disabling spaCy.", exc)
                 self.enable_spacy = False
+        if _shannon_u8 is not None:
+            # Trigger JIT compilation (or cache load) now instead of on the first request.
+            warmup = np.frombuffer(b"warmup", dtype=np.uint8)
+            _shannon_u8(warmup)
+            _token_runs_u8(warmup, _TOKEN_BYTE_TABLE, ENTROPY_MIN_TOKEN_LEN)
+        self._hs_db = None
+        self._hs_scratch = None
+        # A scratch serves one scan at a time; each thread clones its own on first use.
+        self._hs_local = threading.local()
+        if hyperscan is not None:
+            try:
+                self._hs_db = _build_hyperscan_db()
+                self._hs_scratch = hyperscan.Scratch(self._hs_db)
+            except Exception as exc:  # pragma: no cover - platform-specific
+                logger.warning("Hyperscan compile failed: %s; using re fallback.", exc)
+                self._hs_db = None
 
     def _entropy(self, text: str) -> float:
         """Compute Shannon entropy for a token; higher suggests randomness/secrets."""
         if not text:
             return 0.0
-        probs = [text.count(c) / len(text) for c in set(text)]
-        return -sum(p * math.log2(p) for p in probs)
+        if _shannon_u8 is not None and text.isascii():
+            return float(_shannon_u8(np.frombuffer(text.encode("ascii"), dtype=np.uint8)))
+        counts = Counter(text).values()
+        n = len(text)
+        if np is not None and n >= NUMPY_ENTROPY_MIN_LEN:
+            p = np.fromiter(counts, dtype=np.float64) / n
+            return float(-(p * np.log2(p)).sum())
+        return -sum(c * math.log2(c / n) for c in counts) / n
 
-    def _scan_regexes(self, text: str) -> list[SensitiveSegment]:
+    def _candidate_regexes(
+        self, text: str, data: bytes | None = None
+    ) -> list[tuple[str, re.Pattern]]:
+        """
+        Return the regexes that may match, using one Hyperscan pass when available.
+        `data` is the UTF-8 encoding of `text` if the caller already has it.
+        """
+        if self._hs_db is None or self._hs_scratch is None:
+            return ALL_REGEXES
+        hit_ids: set[int] = set()
+
+        def on_match(expr_id: int, start: int, end: int, flags: int, ctx: object) -> None:
+            hit_ids.add(expr_id)
+
+        try:
+            scratch = getattr(self._hs_local, "scratch", None)
+            if scratch is None:
+                scratch = self._hs_local.scratch = self._hs_scratch.clone()
+            self._hs_db.scan(
+                data if data is not None else text.encode("utf-8", errors="replace"),
+                match_event_handler=on_match,
+                scratch=scratch,
+            )
+        except hyperscan.error as exc:
+            logger.warning("Hyperscan scan failed: %s; running all regexes.", exc)
+            return ALL_REGEXES
+        return [ALL_REGEXES[i] for i in sorted(hit_ids)]
+
+    def _scan_regexes(self, text: str, data: bytes | None = None) -> list[SensitiveSegment]:
         """Find regex-based PII and secret candidates."""
         findings: list[SensitiveSegment] = []
-        for label, regex in PII_REGEXES.items():
-            for m in regex.finditer(text):
-                findings.append(
-                    SensitiveSegment(label=label, value=m.group(), start=m.start(), end=m.end())
-                )
-        for label, regex in SECRET_REGEXES.items():
+        for label, regex in self._candidate_regexes(text, data):
             for m in regex.finditer(text):
                 findings.append(
                     SensitiveSegment(label=label, value=m.group(), start=m.start(), end=m.end())
                 )
         return findings
 
-    def _scan_entropy(self, text: str, threshold: float = 3.5) -> list[SensitiveSegment]:
-        """Detect high-entropy tokens as potential secrets."""
+    def _token_spans(self, text: str, data: bytes | None = None) -> list[tuple[int, int]]:
+        """
+        Spans of candidate entropy tokens, via the JIT byte scanner for ASCII text.
+        `data` is the UTF-8 encoding of `text` if the caller already has it.
+        """
+        if _token_runs_u8 is not None:
+            if data is None:
+                data = text.encode("utf-8", errors="replace")
+            # One byte per char means byte offsets are char offsets (pure ASCII; any
+            # replaced surrogate becomes "?", which is outside the token class anyway).
+            if len(data) == len(text):
+                buf = np.frombuffer(data, dtype=np.uint8)
+                runs = _token_runs_u8(buf, _TOKEN_BYTE_TABLE, ENTROPY_MIN_TOKEN_LEN)
+                return [(start, end) for start, end in runs.tolist()]
+        return [m.span() for m in ENTROPY_TOKEN_RE.finditer(text)]
+
+    def _scan_entropy(
+        self, text: str, threshold: float = 3.5, data: bytes | None = None
+    ) -> list[SensitiveSegment]:
+        """Detect high-entropy tokens as potential secrets; `data` as in _token_spans."""
         findings: list[SensitiveSegment] = []
-        tokens = re.findall(r"[A-Za-z0-9\-_]{8,}", text)
-        for token in tokens:
-            ent = self._entropy(token)
-            if ent >= threshold and len(token) >= 16:
+        # Entropy is bounded by log2(distinct chars), so tokens with too few distinct
+        # characters can never reach the threshold and skip the entropy math entirely.
+        min_distinct = math.ceil(2**threshold)
+        for start, end in self._token_spans(text, data):
+            if end - start < ENTROPY_MIN_TOKEN_LEN:
+                continue
+            token = text[start:end]
+            if len(set(token)) < min_distinct:
+                continue
+            if self._entropy(token) >= threshold:
                 findings.append(
-                    SensitiveSegment(
-                        label="high_entropy",
-                        value=token,
-                        start=text.find(token),
-                        end=text.find(token) + len(token),
-                    )
+                    SensitiveSegment(label="high_entropy", value=token, start=start, end=end)
                 )
         return findings
 
@@ -101,34 +299,31 @@ class DLPEngine:
         """Run spaCy NER for broad entity detection if enabled."""
         if not self.enable_spacy or self.nlp is None:
             return []
-        doc = self.nlp(text)
-        labels = {"PERSON", "GPE", "ORG", "NORP", "LOC"}
+        return self._entity_segments(self.nlp(text))
+
+    @staticmethod
+    def _entity_segments(doc: Any) -> list[SensitiveSegment]:
+        """Convert PII-relevant spaCy entities from a parsed doc into segments."""
         return [
             SensitiveSegment(
                 label=ent.label_, value=ent.text, start=ent.start_char, end=ent.end_char
             )
             for ent in doc.ents
-            if ent.label_ in labels
+            if ent.label_ in SPACY_PII_LABELS
         ]
 
-    def analyze(self, prompt: str) -> DLPResult:
-        """
-        Analyze a prompt for PII and secret indicators.
-        Returns a DLPResult with scores and segments; never raises on parse errors.
-        """
+    @staticmethod
+    def _coerce_prompt(prompt: str) -> str:
+        """Coerce non-string prompts to str so analysis never raises on bad input."""
         if not isinstance(prompt, str):
             logger.warning("DLP analyze received non-string prompt; coercing to str.")
-            prompt = str(prompt)
-        regex_hits = self._scan_regexes(prompt)
-        entropy_hits = self._scan_entropy(prompt)
-        spacy_hits = self._scan_spacy(prompt)
+            return str(prompt)
+        return prompt
 
-        all_hits = regex_hits + entropy_hits + spacy_hits
-        pii_hits = [
-            h
-            for h in all_hits
-            if h.label in PII_REGEXES or h.label in {"PERSON", "GPE", "ORG", "NORP", "LOC"}
-        ]
+    def _build_result(self, prompt: str, all_hits: list[SensitiveSegment]) -> DLPResult:
+        """Score combined findings into a DLPResult with segments sorted by start."""
+        all_hits.sort(key=operator.attrgetter("start"))
+        pii_hits = [h for h in all_hits if h.label in PII_REGEXES or h.label in SPACY_PII_LABELS]
         secret_hits = [
             h for h in all_hits if h.label in SECRET_REGEXES or h.label == "high_entropy"
         ]
@@ -147,6 +342,50 @@ class DLPEngine:
             raw_prompt=prompt,
         )
 
+    def analyze(self, prompt: str, prompt_bytes: bytes | None = None) -> DLPResult:
+        """
+        Analyze a prompt for PII and secret indicators.
+        Returns a DLPResult with scores and segments; never raises on parse errors.
+        Pass `prompt_bytes` (UTF-8 of `prompt`) to reuse an existing encoding.
+        """
+        prompt = self._coerce_prompt(prompt)
+        if prompt_bytes is None:
+            # Encode once; both the Hyperscan prefilter and the token scanner read it.
+            prompt_bytes = prompt.encode("utf-8", errors="replace")
+        regex_hits = self._scan_regexes(prompt, prompt_bytes)
+        entropy_hits = self._scan_entropy(prompt, data=prompt_bytes)
+        spacy_hits = self._scan_spacy(prompt)
+        return self._build_result(prompt, regex_hits + entropy_hits + spacy_hits)
+
+    def analyze_many(
+        self, prompts: list[str], prompt_bytes: list[bytes] | None = None
+    ) -> list[DLPResult]:
+        """
+        Analyze a batch of prompts; results match calling analyze() on each one.
+        spaCy NER runs through nlp.pipe so model overhead is amortized per batch.
+        """
+        prompts = [self._coerce_prompt(p) for p in prompts]
+        encoded = (
+            list(prompt_bytes)
+            if prompt_bytes is not None
+            else [p.encode("utf-8", errors="replace") for p in prompts]
+        )
+        if self.enable_spacy and self.nlp is not None:
+            # n_process=1: forking model workers inside the proxy costs more than it saves.
+            docs = self.nlp.pipe(prompts, batch_size=SPACY_BATCH_SIZE, n_process=1)
+            spacy_hits_all = [self._entity_segments(doc) for doc in docs]
+        else:
+            spacy_hits_all = [[] for _ in prompts]
+        return [
+            self._build_result(
+                prompt,
+                self._scan_regexes(prompt, data)
+                + self._scan_entropy(prompt, data=data)
+                + spacy_hits,
+            )
+            for prompt, data, spacy_hits in zip(prompts, encoded, spacy_hits_all, strict=True)
+        ]
+
     @staticmethod
     def synthetic_prompt_with_findings() -> str:
         """Provide a synthetic prompt containing detectable PII/secret patterns."""
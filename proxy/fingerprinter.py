@@ -1,9 +1,17 @@
+import functools
 import logging
 import re
 from dataclasses import dataclass
 
+# Bound on memoized (host, path, header-keys, tls) lookups per Fingerprinter.
+FINGERPRINT_CACHE_SIZE = 4096
 
-@dataclass
+# Reserved keys in the reverse-hostname trie; host labels never contain ".".
+_TRIE_EXACT = "."
+_TRIE_SUFFIX = ".*"
+
+
+@dataclass(frozen=True)
 class FingerprintResult:
     """Outcome of AI service fingerprinting."""
 
@@ -12,7 +20,7 @@ class FingerprintResult:
     api_version: str
     risk_level: str
     confidence: float
-    matched_on: list[str]
+    matched_on: tuple[str, ...]
 
 
 @dataclass
@@ -36,10 +44,14 @@ class Fingerprinter:
 
     def __init__(self) -> None:
         """Prepare fingerprint rules and logger."""
-        self.rules = self._build_rules()
+        # Static catalog data, compiled once per process and shared; never mutated.
+        self.rules, self.domain_trie, self.regex_domain_rules = _shared_rule_index()
         self.logger = logging.getLogger(__name__)
+        # Rules are static after init, so results depend only on the cache key.
+        self._cached_match = functools.lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)(self._match_rules)
 
-    def _build_rules(self) -> list[dict]:
+    @staticmethod
+    def _build_rules() -> list[dict]:
         """Construct heuristic fingerprint rules for known AI providers."""
         # A condensed synthetic catalog; extend easily by adding tuples.
         catalog = [
@@ -134,12 +146,16 @@ class Fingerprinter:
         ]
         rules = []
         for name, domains, paths, headers, model_type, api_version in catalog:
-            domain_regexes = [self._wildcard_to_regex(d) for d in domains]
+            domain_re = re.compile(
+                "(?:" + "|".join(Fingerprinter._wildcard_to_regex_str(d) for d in domains) + ")",
+                re.IGNORECASE,
+            )
             path_regexes = [re.compile(p) for p in paths]
             rules.append(
                 {
                     "service_name": name,
-                    "domains": domain_regexes,
+                    "domain_patterns": [d.lower() for d in domains],
+                    "domain_re": domain_re,
                     "paths": path_regexes,
                     "headers": [h.lower() for h in headers],
                     "model_type": model_type,
@@ -149,32 +165,89 @@ class Fingerprinter:
             )
         return rules
 
-    def _wildcard_to_regex(self, pattern: str) -> re.Pattern:
-        """Convert wildcard domain patterns (e.g., *.example.com) to regex."""
-        escaped = re.escape(pattern).replace(r"\*", ".*")
-        return re.compile(f"^{escaped}$", re.IGNORECASE)
+    @staticmethod
+    def _build_domain_index(rules: list[dict]) -> tuple[dict, list[int]]:
+        """
+        Index rule domains in a reverse-hostname trie (com -> openai -> api).
+        Literal domains mark an exact terminal; a leading "*." marks a suffix match.
+        Rules with any other wildcard placement are returned for regex matching.
+        """
+        trie: dict = {}
+        regex_rules: list[int] = []
+        for idx, rule in enumerate(rules):
+            for domain in rule["domain_patterns"]:
+                labels = domain.split(".")
+                key = _TRIE_EXACT
+                if labels[0] == "*":
+                    labels, key = labels[1:], _TRIE_SUFFIX
+                if "*" in "".join(labels):
+                    regex_rules.append(idx)
+                    continue
+                node = trie
+                for label in reversed(labels):
+                    node = node.setdefault(label, {})
+                node.setdefault(key, set()).add(idx)
+        return trie, sorted(set(regex_rules))
+
+    def _domain_hits(self, host: str) -> set[int]:
+        """Return indices of rules whose domain patterns match the (lowercased) host."""
+        hits: set[int] = set()
+        node = self.domain_trie
+        labels = host.split(".")
+        for depth in range(len(labels) - 1, -1, -1):
+            child = node.get(labels[depth])
+            if child is None:
+                break
+            node = child
+            if depth > 0:
+                hits.update(node.get(_TRIE_SUFFIX, ()))
+            else:
+                hits.update(node.get(_TRIE_EXACT, ()))
+        for idx in self.regex_domain_rules:
+            if self.rules[idx]["domain_re"].fullmatch(host):
+                hits.add(idx)
+        return hits
+
+    @staticmethod
+    def _wildcard_to_regex_str(pattern: str) -> str:
+        """Convert wildcard domain patterns (e.g., *.example.com) to regex source."""
+        return re.escape(pattern).replace(r"\*", ".*")
 
     def fingerprint(self, ctx: RequestContext) -> FingerprintResult | None:
         """
         Best-effort classification of target AI provider from request metadata.
         Returns None if confidence is too low.
         """
-        host = ctx.host.lower()
+        header_keys = frozenset(k.lower() for k in ctx.headers)
+        result = self._cached_match(ctx.host.lower(), ctx.path, header_keys, bool(ctx.tls_ja3))
+        if result is not None:
+            self.logger.debug(
+                "Fingerprint matched %s with score %.2f via %s",
+                result.service_name,
+                result.confidence,
+                result.matched_on,
+            )
+        return result
+
+    def _match_rules(
+        self, host: str, path: str, header_keys: frozenset[str], has_ja3: bool
+    ) -> FingerprintResult | None:
+        """Score every rule against normalized request metadata; memoized per instance."""
         matched: list[tuple[dict, float, list[str]]] = []
-        for rule in self.rules:
+        domain_hits = self._domain_hits(host)
+        for idx, rule in enumerate(self.rules):
             signals = []
             score = 0.0
-            if any(r.match(host) for r in rule["domains"]):
+            if idx in domain_hits:
                 score += 0.5
                 signals.append("domain")
-            if any(p.search(ctx.path) for p in rule["paths"]):
+            if any(p.search(path) for p in rule["paths"]):
                 score += 0.3
                 signals.append("path")
-            header_keys = [h.lower() for h in ctx.headers.keys()]
             if any(h in header_keys for h in rule["headers"]):
                 score += 0.15
                 signals.append("header")
-            if ctx.tls_ja3 and rule["service_name"] in ("OpenAI", "Anthropic"):
+            if has_ja3 and rule["service_name"] in ("OpenAI", "Anthropic"):
                 score += 0.05
                 signals.append("tls-ja3")
             if score >= 0.45:
@@ -182,14 +255,19 @@ class Fingerprinter:
         if not matched:
             return None
         rule, score, signals = sorted(matched, key=lambda x: x[1], reverse=True)[0]
-        self.logger.debug(
-            "Fingerprint matched %s with score %.2f via %s", rule["service_name"], score, signals
-        )
         return FingerprintResult(
             service_name=rule["service_name"],
             model_type=rule["model_type"],
             api_version=rule["api_version"],
             risk_level=rule["risk_level"],
             confidence=round(score, 2),
-            matched_on=signals,
+            matched_on=tuple(signals),
         )
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_rule_index() -> tuple[list[dict], dict, list[int]]:
+    """Build fingerprint rules and their domain index once per process."""
+    rules = Fingerprinter._build_rules()
+    trie, regex_rules = Fingerprinter._build_domain_index(rules)
+    return rules, trie, regex_rules
@@ -1,9 +1,26 @@
 import csv
+import io
+import itertools
 import json
 import logging
+import os
 import time
-from dataclasses import asdict, dataclass
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def _jsonl_line(record: dict[str, Any]) -> bytes:
+    """Serialize a record as one compact JSONL line, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
 
 
 @dataclass
@@ -30,48 +47,76 @@ class GovernanceLogger:
         self,
         jsonl_path: Path = Path("governance_logs.jsonl"),
         csv_path: Path = Path("governance_logs.csv"),
+        max_events: int = 10_000,
     ) -> None:
         """Initialize logger with output paths for JSONL and CSV."""
         self.jsonl_path = jsonl_path
         self.csv_path = csv_path
-        self.events: list[GovernanceEvent] = []
-        self._csv_initialized = False
+        # Only recent events stay in memory; the files remain the full audit trail.
+        self.events: deque[GovernanceEvent] = deque(maxlen=max_events)
+        # Lifetime per-service counts, unaffected by eviction from `events`.
+        self._service_counts: Counter[str] = Counter()
         self.logger = logging.getLogger(__name__)
+        # Long-lived handles, opened on the first log() so a logger that never logs
+        # creates no files. The JSONL handle is unbuffered binary since each event is
+        # emitted as a single write.
+        self._jsonl_f: io.FileIO | None = None
+        self._csv_f: io.TextIOWrapper | None = None
+        self._csv_writer: csv.DictWriter | None = None
+
+    def _open(self) -> tuple[io.FileIO, csv.DictWriter]:
+        """Open the JSONL and CSV handles, writing the CSV header to a new file."""
+        self._jsonl_f = open(self.jsonl_path, "ab", buffering=0)
+        self._csv_f = open(self.csv_path, "a", newline="", buffering=1)
+        self._csv_writer = csv.DictWriter(
+            self._csv_f, fieldnames=[f.name for f in fields(GovernanceEvent)]
+        )
+        if self._csv_f.tell() == 0:
+            self._csv_writer.writeheader()
+        return self._jsonl_f, self._csv_writer
 
     def log(self, event: GovernanceEvent) -> None:
         """Persist a governance event to memory, JSONL, and CSV."""
         self.events.append(event)
-        self._write_jsonl(event)
-        self._write_csv(event)
+        self._service_counts[event.target_service] += 1
+        record = asdict(event)
+        jsonl_f, csv_writer = self._jsonl_f, self._csv_writer
+        if jsonl_f is None or csv_writer is None:
+            jsonl_f, csv_writer = self._open()
+        jsonl_f.write(_jsonl_line(record))
+        csv_writer.writerow(record)
         self.logger.info(
             "Logged governance event for %s (action=%s)", event.target_service, event.action
         )
 
-    def _write_jsonl(self, event: GovernanceEvent) -> None:
-        """Append a governance event to JSONL file."""
-        with open(self.jsonl_path, "a") as f:
-            f.write(json.dumps(asdict(event)) + "\n")
-
-    def _write_csv(self, event: GovernanceEvent) -> None:
-        """Append a governance event to CSV file, writing headers on first use."""
-        fieldnames = list(asdict(event).keys())
-        new_file = not self.csv_path.exists()
-        with open(self.csv_path, "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if new_file:
-                writer.writeheader()
-            writer.writerow(asdict(event))
+    def close(self) -> None:
+        """Flush, fsync, and close the JSONL and CSV handles; a later log() reopens them."""
+        self._close(sync=True)
+
+    def _close(self, sync: bool) -> None:
+        """Flush and close any open handles, fsyncing them first when `sync` is set."""
+        for f in (self._jsonl_f, self._csv_f):
+            if f is None or f.closed:
+                continue
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+            f.close()
+        self._jsonl_f = self._csv_f = self._csv_writer = None
+
+    def __del__(self) -> None:
+        """Close file handles on garbage collection; durability is left to close()."""
+        if hasattr(self, "_csv_f"):
+            self._close(sync=False)
 
     def latest(self, limit: int = 50) -> list[GovernanceEvent]:
         """Return the most recent governance events."""
-        return self.events[-limit:]
+        start = max(0, len(self.events) - limit)
+        return list(itertools.islice(self.events, start, None))
 
     def stats(self) -> dict[str, int]:
-        """Aggregate counts per target service."""
-        counts: dict[str, int] = {}
-        for e in self.events:
-            counts[e.target_service] = counts.get(e.target_service, 0) + 1
-        return counts
+        """Aggregate counts per target service over the logger's lifetime."""
+        return dict(self._service_counts)
 
     @staticmethod
     def synthetic_event(**kwargs) -> GovernanceEvent:
@@ -1,4 +1,7 @@
+import datetime
+import fcntl
 import logging
+import os
 import ssl
 import tempfile
 from dataclasses import dataclass
@@ -7,7 +10,8 @@ from pathlib import Path
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
 from cryptography.x509.oid import NameOID
 
 try:
@@ -18,6 +22,12 @@ except Exception:  # pragma: no cover - proxy.py optional for demo
     Proxy = None  # type: ignore
 
 
+# Persisted across restarts so the CA is generated once, not per process.
+CA_CACHE_DIR = Path.home() / ".cache" / "shadowai-ca"
+
+logger = logging.getLogger(__name__)
+
+
 @dataclass
 class CertificateBundle:
     """Paths to synthetic root CA certificate and key."""
@@ -27,9 +37,82 @@ class CertificateBundle:
     generated_dir: Path
 
 
-def generate_root_ca(common_name: str = "Synthetic ShadowAI CA") -> CertificateBundle:
-    """Generate a self-signed CA certificate for synthetic MITM demos."""
-    key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+def _public_key_der(key: PublicKeyTypes) -> bytes:
+    """DER SubjectPublicKeyInfo bytes, used to compare public keys."""
+    return key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
+def _write_atomic(path: Path, data: bytes, mode: int) -> None:
+    """Write via a temp file in the same directory and os.replace it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_cached_root_ca(cache_dir: Path = CA_CACHE_DIR) -> CertificateBundle | None:
+    """Return the cached CA bundle if present, unexpired, and key-matched, else None."""
+    ca_cert_path = cache_dir / "ca.crt"
+    ca_key_path = cache_dir / "ca.key"
+    if not (ca_cert_path.is_file() and ca_key_path.is_file()):
+        return None
+    try:
+        cert = x509.load_pem_x509_certificate(ca_cert_path.read_bytes())
+    except ValueError as exc:
+        logger.warning("Cached CA at %s is unreadable (%s); regenerating.", ca_cert_path, exc)
+        return None
+    if cert.not_valid_after_utc <= datetime.datetime.now(datetime.timezone.utc):
+        logger.info("Cached CA at %s expired; regenerating.", ca_cert_path)
+        return None
+    # A crash or concurrent generation can leave a key that is truncated or belongs
+    # to a different cert; either would make every build_ssl_context call fail.
+    try:
+        key = serialization.load_pem_private_key(ca_key_path.read_bytes(), password=None)
+    except (ValueError, TypeError) as exc:
+        logger.warning("Cached CA key at %s is unreadable (%s); regenerating.", ca_key_path, exc)
+        return None
+    if _public_key_der(key.public_key()) != _public_key_der(cert.public_key()):
+        logger.warning("Cached CA key at %s does not match cert; regenerating.", ca_key_path)
+        return None
+    return CertificateBundle(
+        ca_cert_path=ca_cert_path, ca_key_path=ca_key_path, generated_dir=cache_dir
+    )
+
+
+def load_or_generate_root_ca(cache_dir: Path = CA_CACHE_DIR) -> CertificateBundle:
+    """Reuse the cached CA bundle, generating and caching a new one on first run."""
+    bundle = load_cached_root_ca(cache_dir)
+    if bundle is not None:
+        return bundle
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Key and cert are replaced one at a time, so two unserialized generators could
+    # leave one's key beside the other's cert. Generate under an exclusive lock and
+    # re-check the cache once it is held, in case another process just finished.
+    with open(cache_dir / ".lock", "wb") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return load_cached_root_ca(cache_dir) or generate_root_ca(out_dir=cache_dir)
+
+
+def generate_root_ca(
+    common_name: str = "Synthetic ShadowAI CA", out_dir: Path | None = None
+) -> CertificateBundle:
+    """
+    Generate a self-signed CA certificate for synthetic MITM demos.
+    Writes into a fresh temp dir unless `out_dir` is given; only
+    load_or_generate_root_ca targets the persisted cache.
+    """
+    # P-256 keygen is orders of magnitude faster than RSA-2048.
+    key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    now = datetime.datetime.now(datetime.timezone.utc)
     subject = issuer = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
     cert = (
         x509.CertificateBuilder()
@@ -37,28 +120,33 @@ def generate_root_ca(common_name: str = "Synthetic ShadowAI CA") -> CertificateB
         .issuer_name(issuer)
         .public_key(key.public_key())
         .serial_number(x509.random_serial_number())
-        .not_valid_before(x509.datetime.datetime.utcnow())
-        .not_valid_after(x509.datetime.datetime.utcnow() + x509.datetime.timedelta(days=365))
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=365))
         .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
         .sign(key, hashes.SHA256(), default_backend())
     )
 
-    temp_dir = Path(tempfile.mkdtemp(prefix="shadowai-ca-"))
-    ca_cert_path = temp_dir / "ca.crt"
-    ca_key_path = temp_dir / "ca.key"
-
-    with open(ca_cert_path, "wb") as f:
-        f.write(cert.public_bytes(serialization.Encoding.PEM))
-    with open(ca_key_path, "wb") as f:
-        f.write(
-            key.private_bytes(
-                serialization.Encoding.PEM,
-                serialization.PrivateFormat.TraditionalOpenSSL,
-                serialization.NoEncryption(),
-            )
-        )
+    if out_dir is None:
+        out_dir = Path(tempfile.mkdtemp(prefix="shadowai-ca-"))
+    else:
+        out_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    ca_cert_path = out_dir / "ca.crt"
+    ca_key_path = out_dir / "ca.key"
+
+    # Key first, each replaced atomically, so a reader never sees a partial file;
+    # concurrent generation into the cache is serialized by load_or_generate_root_ca.
+    _write_atomic(
+        ca_key_path,
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ),
+        0o600,
+    )
+    _write_atomic(ca_cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644)
     return CertificateBundle(
-        ca_cert_path=ca_cert_path, ca_key_path=ca_key_path, generated_dir=temp_dir
+        ca_cert_path=ca_cert_path, ca_key_path=ca_key_path, generated_dir=out_dir
     )
 
 
@@ -82,10 +170,17 @@ class SyntheticMITMPlugin(HttpProxyBasePlugin):  # pragma: no cover - requires p
 
 class MITMLayer:
     def __init__(self, bundle: CertificateBundle | None = None) -> None:
-        """Create a MITM layer with a synthetic root CA bundle."""
-        self.bundle = bundle or generate_root_ca()
+        """Create a MITM layer; the root CA is loaded or generated on first use."""
+        self._bundle = bundle
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def bundle(self) -> CertificateBundle:
+        """Root CA bundle, reused from the on-disk cache when still valid."""
+        if self._bundle is None:
+            self._bundle = load_or_generate_root_ca()
+        return self._bundle
+
     def start(self, listen_addr: str = "0.0.0.0:8899") -> None:
         """Start proxy.py-based MITM proxy; lab-only."""
         if Proxy is None:
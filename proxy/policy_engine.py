@@ -4,6 +4,21 @@ from dataclasses import dataclass
 from proxy.dlp_engine import DLPResult
 from proxy.fingerprinter import FingerprintResult
 
+try:
+    import ahocorasick
+except Exception:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+# Case-insensitive adversarial phrases that trigger the safe-mode rewrite rule.
+JAILBREAK_PHRASES = [
+    "ignore previous",
+    "ignore all previous",
+    "ignore the above",
+    "disregard previous",
+    "disregard all prior",
+    "forget your instructions",
+]
+
 
 @dataclass
 class PolicyDecision:
@@ -27,15 +42,29 @@ class PolicyEngine:
         self.whitelist = set(whitelist or [])
         self.enforce_external_block = enforce_external_block
         self.logger = logging.getLogger(__name__)
-        self._severity = ["allow", "redact", "mask", "rewrite", "block"]
+        self._severity_rank = {
+            action: rank
+            for rank, action in enumerate(["allow", "redact", "mask", "rewrite", "block"])
+        }
+        self._jailbreak_ac = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for idx, phrase in enumerate(JAILBREAK_PHRASES):
+                automaton.add_word(phrase.casefold(), idx)
+            automaton.make_automaton()
+            self._jailbreak_ac = automaton
+
+    def _has_jailbreak_phrase(self, prompt: str) -> bool:
+        """Check for any jailbreak phrase in one case-folded pass over the prompt."""
+        folded = prompt.casefold()
+        if self._jailbreak_ac is not None:
+            return next(self._jailbreak_ac.iter(folded), None) is not None
+        return any(phrase in folded for phrase in JAILBREAK_PHRASES)
 
     def _bump_action(self, current: str, candidate: str) -> str:
         """Pick the higher-severity action."""
-        return (
-            candidate
-            if self._severity.index(candidate) > self._severity.index(current)
-            else current
-        )
+        rank = self._severity_rank
+        return candidate if rank[candidate] > rank[current] else current
 
     def evaluate(self, fp: FingerprintResult | None, dlp: DLPResult) -> PolicyDecision:
         """
@@ -63,7 +92,7 @@ class PolicyEngine:
             reasons.append(f"External LLM {fp.service_name} not whitelisted")
             action = self._bump_action(action, "block")
         # Simple jailbreak heuristic: presence of adversarial phrases.
-        if dlp.raw_prompt and "ignore previous" in dlp.raw_prompt.lower():
+        if dlp.raw_prompt and self._has_jailbreak_phrase(dlp.raw_prompt):
             matches.append("RULE_SAFE_MODE_REWRITE")
             reasons.append("Jailbreak-like content")
             action = self._bump_action(action, "rewrite")
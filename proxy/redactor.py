@@ -1,85 +1,251 @@
+import hashlib
 import logging
+import operator
+import sys
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 
-from proxy.dlp_engine import DLPResult
+from proxy.dlp_engine import DLPResult, SensitiveSegment
 
 
-@dataclass
+def _apply_edits(prompt: str, edits: list[tuple[int, int, str]]) -> str:
+    """Apply sorted edits in one left-to-right pass, joining the pieces once."""
+    parts: list[str] = []
+    cursor = 0
+    for start, end, token in edits:
+        parts.append(prompt[cursor:start])
+        parts.append(token)
+        cursor = end
+    parts.append(prompt[cursor:])
+    return "".join(parts)
+
+
+class LazyRedactedText:
+    """
+    Redacted text kept as the original prompt plus edits; the string is built on
+    first str() and cached, so callers that never read the text never pay for it.
+    """
+
+    __slots__ = ("_prompt", "_edits", "_cached")
+
+    def __init__(self, prompt: str, edits: list[tuple[int, int, str]]) -> None:
+        """Wrap a prompt and its sorted, non-overlapping edits."""
+        self._prompt = prompt
+        self._edits = edits
+        self._cached: str | None = None
+
+    @property
+    def prompt(self) -> str:
+        """The original, unredacted prompt the edits apply to."""
+        return self._prompt
+
+    @property
+    def edits(self) -> list[tuple[int, int, str]]:
+        """(start, end, replacement) edits against the original prompt."""
+        return self._edits
+
+    def __str__(self) -> str:
+        """Materialize (once) and return the redacted string."""
+        if self._cached is None:
+            self._cached = _apply_edits(self._prompt, self._edits)
+        return self._cached
+
+    def __repr__(self) -> str:
+        """Debug representation showing the materialized text."""
+        return f"LazyRedactedText({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by materialized text against str or another LazyRedactedText."""
+        if isinstance(other, (str, LazyRedactedText)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash like the materialized string."""
+        return hash(str(self))
+
+
+@dataclass(slots=True, frozen=True, init=False)
 class RedactionOutcome:
     action: str  # allow | redact | block | mask | rewrite
-    redacted_text: str | None
+    _text: str | LazyRedactedText | None
     blocked: bool
-    notes: list[str]
+    notes: tuple[str, ...]
+
+    def __init__(
+        self,
+        action: str,
+        redacted_text: str | LazyRedactedText | None,
+        blocked: bool,
+        notes: tuple[str, ...],
+    ) -> None:
+        """Create an outcome; `redacted_text` may be deferred as a LazyRedactedText."""
+        object.__setattr__(self, "action", action)
+        object.__setattr__(self, "_text", redacted_text)
+        object.__setattr__(self, "blocked", blocked)
+        object.__setattr__(self, "notes", notes)
+
+    @property
+    def redacted_text(self) -> str | None:
+        """Redacted string; a deferred redaction is built on first access and cached."""
+        text = self._text
+        return None if text is None else str(text)
+
+    @property
+    def lazy_text(self) -> LazyRedactedText | None:
+        """Prompt plus edits when the text is still deferred, for re-serializing callers."""
+        text = self._text
+        return text if isinstance(text, LazyRedactedText) else None
+
 
+# Constant outcomes shared by every block/rewrite call; callers only read them.
+_BLOCK_OUTCOME = RedactionOutcome(
+    action="block", redacted_text=None, blocked=True, notes=("blocked by policy",)
+)
+_REWRITE_OUTCOME = RedactionOutcome(
+    action="rewrite",
+    redacted_text="This prompt was rewritten to safe mode. Original content withheld.",
+    blocked=False,
+    notes=("safe-mode rewrite",),
+)
 
+
+# Interned so every redaction reuses the same token objects.
+DEFAULT_TOKEN = sys.intern("[REDACTED]")
 REDACTION_TOKENS = {
-    "pii": "[REDACTED—PII]",
-    "secret": "[REDACTED—SECRET]",
-    "high_entropy": "[REDACTED—SECRET]",
+    label: sys.intern(token)
+    for label, token in {
+        "pii": "[REDACTED—PII]",
+        "secret": "[REDACTED—SECRET]",
+        "high_entropy": "[REDACTED—SECRET]",
+    }.items()
 }
 
+# Value -> mask token memo; cleared wholesale when full to bound memory under
+# adversarial input. Dict get/set are atomic under the GIL, so it is thread-safe.
+MASK_CACHE_MAX_ENTRIES = 4096
+_MASK_CACHE: dict[str, str] = {}
+
+# _basic_redact notes indexed by (blocked << 1) | modified; blocked wins over modified.
+_REDACT_NOTES: tuple[tuple[str, ...], ...] = (
+    ("no redaction needed",),
+    ("redaction applied",),
+    ("blocked due to high risk",),
+    ("blocked due to high risk",),
+)
+
+
+def _unchanged_outcome(prompt: str) -> RedactionOutcome:
+    """Outcome for a prompt with no findings: the text passes through as-is."""
+    return RedactionOutcome(
+        action="redact", redacted_text=prompt, blocked=False, notes=_REDACT_NOTES[0]
+    )
+
+
+_BY_START = operator.attrgetter("start")
+
+
+def _collect_edits(
+    segments: Sequence[SensitiveSegment],
+    replacement: Callable[[SensitiveSegment], str],
+) -> list[tuple[int, int, str]]:
+    """
+    Turn segments into non-overlapping (start, end, replacement) edits, merging
+    overlaps into the first one's replacement. DLPEngine emits segments sorted by
+    start; a hand-built DLPResult may not, so out-of-order input is re-sorted.
+    """
+    edits: list[tuple[int, int, str]] = []
+    cursor = 0
+    prev_start = 0
+    for segment in segments:
+        if segment.start < prev_start:
+            # Skipping here would leave the segment unredacted; redo the pass sorted.
+            return _collect_edits(sorted(segments, key=_BY_START), replacement)
+        prev_start = segment.start
+        if segment.end <= cursor:
+            continue
+        if segment.start >= cursor:
+            edits.append((segment.start, segment.end, replacement(segment)))
+        else:
+            start, _, token = edits[-1]
+            edits[-1] = (start, segment.end, token)
+        cursor = segment.end
+    return edits
+
+
+def _redacted_text(prompt: str, edits: list[tuple[int, int, str]]) -> str | LazyRedactedText:
+    """Return the prompt itself when unchanged, else a lazily built redaction."""
+    return LazyRedactedText(prompt, edits) if edits else prompt
+
 
 class Redactor:
     """Redacts, masks, rewrites, or blocks prompts based on DLP findings."""
 
     def __init__(self) -> None:
-        """Initialize redactor with module logger."""
+        """Initialize redactor with module logger and mode dispatch table."""
         self.logger = logging.getLogger(__name__)
+        # Unknown modes (including "allow") fall back to _basic_redact.
+        self._dispatch: dict[str, Callable[[str, DLPResult], RedactionOutcome]] = {
+            "block": lambda prompt, dlp: _BLOCK_OUTCOME,
+            "mask": self._mask,
+            "rewrite": lambda prompt, dlp: _REWRITE_OUTCOME,
+            "redact": self._basic_redact,
+        }
 
     def redact(self, prompt: str, dlp: DLPResult, mode: str = "redact") -> RedactionOutcome:
         """Apply the selected redaction/masking/blocking strategy to a prompt."""
-        if mode == "block":
-            return RedactionOutcome(
-                action="block", redacted_text=None, blocked=True, notes=["blocked by policy"]
-            )
-        if mode == "mask":
-            return self._mask(prompt, dlp)
-        if mode == "rewrite":
-            rewritten = "This prompt was rewritten to safe mode. Original content withheld."
-            return RedactionOutcome(
-                action="rewrite",
-                redacted_text=rewritten,
-                blocked=False,
-                notes=["safe-mode rewrite"],
-            )
-        return self._basic_redact(prompt, dlp)
+        return self._dispatch.get(mode, self._basic_redact)(prompt, dlp)
 
     def _basic_redact(self, prompt: str, dlp: DLPResult) -> RedactionOutcome:
         """Replace sensitive segments with redaction tokens; block on high risk."""
-        redacted = prompt
-        for segment in sorted(dlp.sensitive_segments, key=lambda s: s.start, reverse=True):
-            token = REDACTION_TOKENS.get(segment.label, "[REDACTED]")
-            redacted = redacted[: segment.start] + token + redacted[segment.end :]
         blocked = dlp.pii_score >= 0.8 or dlp.secret_leakage_score >= 0.8
-        notes = []
-        if blocked:
-            notes.append("blocked due to high risk")
-        elif redacted != prompt:
-            notes.append("redaction applied")
-        else:
-            notes.append("no redaction needed")
+        if not dlp.sensitive_segments and not blocked:
+            # Clean-prompt fast path: nothing to splice, compare, or log.
+            return _unchanged_outcome(prompt)
+        get_token = REDACTION_TOKENS.get
+        edits = _collect_edits(
+            dlp.sensitive_segments, lambda segment: get_token(segment.label, DEFAULT_TOKEN)
+        )
+        modified = bool(edits)
+        notes = _REDACT_NOTES[(blocked << 1) | modified]
+        log = self.logger
         if blocked:
-            self.logger.warning(
-                "Prompt blocked due to high risk (pii=%.2f, secret=%.2f)",
-                dlp.pii_score,
-                dlp.secret_leakage_score,
-            )
-        elif redacted != prompt:
-            self.logger.info("Prompt redaction applied (%d segments)", len(dlp.sensitive_segments))
+            if log.isEnabledFor(logging.WARNING):
+                log.warning(
+                    "Prompt blocked due to high risk (pii=%.2f, secret=%.2f)",
+                    dlp.pii_score,
+                    dlp.secret_leakage_score,
+                )
+        elif modified and log.isEnabledFor(logging.INFO):
+            log.info("Prompt redaction applied (%d segments)", len(dlp.sensitive_segments))
         return RedactionOutcome(
-            action="redact", redacted_text=redacted, blocked=blocked, notes=notes
+            action="redact",
+            redacted_text=_redacted_text(prompt, edits),
+            blocked=blocked,
+            notes=notes,
         )
 
     def _mask(self, prompt: str, dlp: DLPResult) -> RedactionOutcome:
         """Mask sensitive segments with hashed tokens."""
-        masked = prompt
-        for segment in sorted(dlp.sensitive_segments, key=lambda s: s.start, reverse=True):
-            masked_segment = self._hash_like(segment.value)
-            masked = masked[: segment.start] + masked_segment + masked[segment.end :]
+        edits = _collect_edits(
+            dlp.sensitive_segments, lambda segment: self._hash_like(segment.value)
+        )
         return RedactionOutcome(
-            action="mask", redacted_text=masked, blocked=False, notes=["masking applied"]
+            action="mask",
+            redacted_text=_redacted_text(prompt, edits),
+            blocked=False,
+            notes=("masking applied",),
         )
 
     def _hash_like(self, value: str) -> str:
-        """Create a deterministic mask token for a value."""
-        return f"[MASK:{abs(hash(value)) % 10_000_000}]"
+        """Create a deterministic mask token for a value, stable across processes."""
+        cache = _MASK_CACHE
+        token = cache.get(value)
+        if token is not None:
+            return token
+        if len(cache) >= MASK_CACHE_MAX_ENTRIES:
+            cache.clear()
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        token = f"[MASK:{int.from_bytes(digest, 'big') % 10_000_000}]"
+        cache[value] = token
+        return token
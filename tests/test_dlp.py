@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from proxy.dlp_engine import DLPEngine
 
 
@@ -10,3 +12,42 @@ def test_detects_pii_and_secrets():
     labels = {s.label for s in result.sensitive_segments}
     assert "email" in labels
     assert any(label in labels for label in ("api_key", "high_entropy"))
+
+
+def test_prefilter_matches_plain_regex_scan():
+    engine = DLPEngine(enable_spacy=False)
+    prompt = engine.synthetic_prompt_with_findings() + " jwt eyJabc.def.ghi tfn 123 456 789"
+    prefiltered = engine._scan_regexes(prompt)
+    engine._hs_db = None
+    assert prefiltered == engine._scan_regexes(prompt)
+
+
+def test_analyze_many_matches_analyze():
+    engine = DLPEngine(enable_spacy=False)
+    prompts = [
+        engine.synthetic_prompt_with_findings(),
+        "nothing to see here",
+        engine.random_secret(),
+    ]
+    assert engine.analyze_many(prompts) == [engine.analyze(p) for p in prompts]
+
+
+def test_entropy_scan_same_for_ascii_and_unicode_paths():
+    engine = DLPEngine(enable_spacy=False)
+    secret = engine.random_secret()
+    ascii_prompt = f"token {secret} and again {secret} plus shortword"
+    unicode_prompt = ascii_prompt + " café"
+    ascii_hits = engine._scan_entropy(ascii_prompt)
+    assert [(s.start, s.value) for s in ascii_hits] == [
+        (s.start, s.value) for s in engine._scan_entropy(unicode_prompt)
+    ]
+    assert len(ascii_hits) == 2 and ascii_hits[1].start > ascii_hits[0].start
+
+
+def test_concurrent_analyze_is_thread_safe():
+    engine = DLPEngine(enable_spacy=False)
+    prompt = engine.synthetic_prompt_with_findings() * 200
+    expected = engine.analyze(prompt)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(engine.analyze, [prompt] * 32))
+    assert all(r == expected for r in results)
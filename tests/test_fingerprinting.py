@@ -15,3 +15,33 @@ def test_fingerprints_openai_chat():
     assert result.service_name == "OpenAI"
     assert result.model_type == "chat"
     assert result.confidence >= 0.5
+
+
+def test_repeated_requests_hit_cache():
+    fp = Fingerprinter()
+    ctx = RequestContext(
+        host="API.Anthropic.com",
+        path="/v1/messages",
+        method="POST",
+        headers={"anthropic-version": "2023-06-01"},
+    )
+    first = fp.fingerprint(ctx)
+    assert first is not None and first.service_name == "Anthropic"
+    assert fp.fingerprint(ctx) is first
+    assert fp._cached_match.cache_info().hits == 1
+
+
+def test_domain_trie_agrees_with_domain_regexes():
+    fp = Fingerprinter()
+    hosts = [
+        "api.openai.com",
+        "myresource.openai.azure.com",
+        "openai.azure.com",
+        "bedrock-runtime.us-east-1.amazonaws.com",
+        "claude.ai",
+        "sub.claude.ai",
+        "example.com",
+    ]
+    for host in hosts:
+        expected = {i for i, r in enumerate(fp.rules) if r["domain_re"].fullmatch(host)}
+        assert fp._domain_hits(host) == expected, host
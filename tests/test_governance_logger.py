@@ -0,0 +1,45 @@
+import csv
+import json
+
+from proxy.governance_logger import GovernanceLogger
+
+
+def test_persists_events_with_single_csv_header(tmp_path):
+    jsonl_path = tmp_path / "events.jsonl"
+    csv_path = tmp_path / "events.csv"
+    gov = GovernanceLogger(jsonl_path=jsonl_path, csv_path=csv_path)
+    gov.log(GovernanceLogger.synthetic_event(target_service="OpenAI"))
+    gov.close()
+
+    gov = GovernanceLogger(jsonl_path=jsonl_path, csv_path=csv_path)
+    gov.log(GovernanceLogger.synthetic_event(target_service="Anthropic"))
+    gov.close()
+
+    records = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert [r["target_service"] for r in records] == ["OpenAI", "Anthropic"]
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["target_service"] for r in rows] == ["OpenAI", "Anthropic"]
+
+
+def test_files_are_created_on_first_log_only(tmp_path):
+    jsonl_path = tmp_path / "events.jsonl"
+    csv_path = tmp_path / "events.csv"
+    gov = GovernanceLogger(jsonl_path=jsonl_path, csv_path=csv_path)
+    gov.close()
+    assert not jsonl_path.exists() and not csv_path.exists()
+    gov.log(GovernanceLogger.synthetic_event())
+    gov.close()
+    assert jsonl_path.exists() and csv_path.exists()
+
+
+def test_bounded_history_keeps_lifetime_stats(tmp_path):
+    gov = GovernanceLogger(
+        jsonl_path=tmp_path / "events.jsonl", csv_path=tmp_path / "events.csv", max_events=2
+    )
+    for service in ("OpenAI", "OpenAI", "Anthropic"):
+        gov.log(GovernanceLogger.synthetic_event(target_service=service))
+    gov.close()
+    assert [e.target_service for e in gov.latest()] == ["OpenAI", "Anthropic"]
+    assert [e.target_service for e in gov.latest(1)] == ["Anthropic"]
+    assert gov.stats() == {"OpenAI": 2, "Anthropic": 1}
@@ -1,8 +1,8 @@
-from proxy.main import InterceptedRequest, ProxyOrchestrator
+from proxy.main import InterceptedRequest, get_default_orchestrator
 
 
 def test_policy_and_redaction_flow():
-    orch = ProxyOrchestrator()
+    orch = get_default_orchestrator()
     req = InterceptedRequest(
         session_id="s-test",
         user_id="user-test",
@@ -23,7 +23,7 @@ def test_policy_and_redaction_flow():
 
 
 def test_block_priority_over_rewrite():
-    orch = ProxyOrchestrator()
+    orch = get_default_orchestrator()
     req = InterceptedRequest(
         session_id="s-test2",
         user_id="user-test2",
@@ -37,3 +37,20 @@ def test_block_priority_over_rewrite():
     assert event.action == "block"  # block must trump rewrite
     assert "RULE_BLOCK_SECRETS" in event.policy_triggered
     assert event.risk_score > 0.5
+
+
+def test_benign_prompt_is_allowed_without_redaction():
+    orch = get_default_orchestrator()
+    req = InterceptedRequest(
+        session_id="s-test3",
+        user_id="user-test3",
+        host="api.openai.com",
+        path="/v1/chat/completions",
+        method="POST",
+        headers={"Content-Type": "application/json", "OpenAI-Organization": "demo"},
+        body="Summarize the plot of a classic novel in two sentences.",
+    )
+    event = orch.handle(req)
+    assert event.action == "allow"
+    assert event.redaction_applied is False
+    assert "no redaction needed" in event.notes
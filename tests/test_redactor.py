@@ -0,0 +1,53 @@
+import json
+
+from proxy.dlp_engine import DLPResult, SensitiveSegment
+from proxy.redactor import Redactor
+
+
+def _dlp(prompt, segments, pii=0.2, secret=0.0):
+    return DLPResult(
+        pii_score=pii, secret_leakage_score=secret, sensitive_segments=segments, raw_prompt=prompt
+    )
+
+
+def test_redacts_segments_in_order_and_merges_overlaps():
+    prompt = "mail a@b.io key=ABCDEFGHIJKLMNOP end"
+    segments = [
+        SensitiveSegment("email", "a@b.io", 5, 11),
+        SensitiveSegment("api_key", "key=ABCDEFGHIJKLMNOP", 12, 32),
+        SensitiveSegment("high_entropy", "ABCDEFGHIJKLMNOP", 16, 32),
+    ]
+    outcome = Redactor().redact(prompt, _dlp(prompt, segments))
+    assert outcome.lazy_text is not None and outcome.lazy_text.prompt == prompt
+    assert outcome.redacted_text == "mail [REDACTED] [REDACTED] end"
+    assert json.dumps(outcome.redacted_text) == json.dumps("mail [REDACTED] [REDACTED] end")
+    assert outcome.notes == ("redaction applied",)
+    assert not outcome.blocked
+
+
+def test_unsorted_segments_are_still_redacted_and_masked():
+    prompt = "mail a@b.io key=ABCDEFGHIJKLMNOP end"
+    segments = [
+        SensitiveSegment("api_key", "key=ABCDEFGHIJKLMNOP", 12, 32),
+        SensitiveSegment("email", "a@b.io", 5, 11),
+    ]
+    redacted = Redactor().redact(prompt, _dlp(prompt, segments)).redacted_text
+    assert redacted == "mail [REDACTED] [REDACTED] end"
+    masked = Redactor().redact(prompt, _dlp(prompt, segments), mode="mask").redacted_text
+    assert "a@b.io" not in masked and "ABCDEFGHIJKLMNOP" not in masked
+
+
+def test_mask_is_consistent_for_repeated_values():
+    prompt = "a@b.io and a@b.io"
+    segments = [
+        SensitiveSegment("email", "a@b.io", 0, 6),
+        SensitiveSegment("email", "a@b.io", 11, 17),
+    ]
+    masked = Redactor().redact(prompt, _dlp(prompt, segments), mode="mask").redacted_text
+    first, second = masked.split(" and ")
+    assert first == second and first.startswith("[MASK:")
+
+
+def test_mask_tokens_are_stable_across_processes():
+    # Fixed expectation: must not depend on PYTHONHASHSEED.
+    assert Redactor()._hash_like("alice@example.com") == "[MASK:352906]"